@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import json
+from bisect import bisect_right
+from datetime import date, datetime
 import base64
+import html
+import re
+import zlib
 
 # Page config
 st.set_page_config(
@@ -11,8 +13,9 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS. Streamlit drops any element a rerun does not emit again, so this
+# must be written on every run; a once-per-session guard would unstyle the app.
+_APP_CSS = """
 <style>
     .metric-card {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -39,6 +42,12 @@ st.markdown("""
         border-left: 4px solid #667eea;
         margin: 1rem 0;
     }
+    .step-progress {
+        display: flex;
+    }
+    .step-progress h3 {
+        flex: 1;
+    }
     .quality-badge {
         display: inline-block;
         padding: 0.5rem 1rem;
@@ -47,15 +56,150 @@ st.markdown("""
         margin: 0.25rem;
     }
 </style>
-""", unsafe_allow_html=True)
-
-# Initialize session state
-if 'current_step' not in st.session_state:
-    st.session_state.current_step = 1
-if 'vendor_data' not in st.session_state:
-    st.session_state.vendor_data = {}
-if 'final_result' not in st.session_state:
-    st.session_state.final_result = None
+"""
+st.markdown(_APP_CSS, unsafe_allow_html=True)
+
+# Certificate CSS: static, the badge colour comes in through the --cert-color variable
+_CERT_CSS = """
+    body { font-family: system-ui, -apple-system, 'Segoe UI', Roboto, sans-serif; padding: 40px; background: #fff; -webkit-print-color-adjust: exact; }
+    .container { 
+        border: 5px solid var(--cert-color); 
+        padding: 40px; 
+        border-radius: 15px; 
+        text-align: center; 
+        max-width: 800px; 
+        margin: 0 auto; 
+    }
+    .header { 
+        background: var(--cert-color); 
+        color: white; 
+        padding: 20px; 
+        margin: -40px -40px 30px -40px; 
+        border-radius: 9px 9px 0 0;
+    }
+    .vendor { 
+        font-size: 32px; 
+        font-weight: bold; 
+        text-transform: uppercase; 
+        margin: 20px 0; 
+        color: #111;
+    }
+    .badge { 
+        font-size: 24px; 
+        color: var(--cert-color); 
+        font-weight: bold; 
+        border: 3px solid var(--cert-color); 
+        padding: 10px 40px; 
+        border-radius: 50px; 
+        display: inline-block; 
+        margin: 15px 0;
+    }
+    .score-display {
+        font-size: 36px;
+        font-weight: 800;
+        color: var(--cert-color);
+        margin-bottom: 10px;
+    }
+    .footer { 
+        margin-top: 40px; 
+        font-size: 12px; 
+        color: #666; 
+        border-top: 1px solid #ccc; 
+        padding-top: 20px; 
+    }
+"""
+
+# Certificate page, filled with str.format_map when a download is requested
+_CERT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <style>
+        {cert_css}
+    </style>
+</head>
+<body style="--cert-color: {cert_color};">
+    <div class="container">
+        <div class="header">
+            {logo_html}
+            <h1>{cert_title}</h1>
+            <p>Zolarux Trust Infrastructure</p>
+        </div>
+        
+        <p style="font-size: 16px; color: #555;">This officially certifies that</p>
+        
+        <div class="vendor">{vendor_name}</div>
+        
+        <p style="font-size: 14px; color: #555;">has successfully undergone the <strong>{verification_text}</strong> process.</p>
+        
+        <br>
+        {score_html}
+        <div class="badge">{cert_status}</div>
+        
+        {validity_html}
+        
+        {report_html}
+        
+        {sig_html}
+        
+        <div class="footer">
+            <p>Generated on {generated_on}</p>
+            <p>Verification ID: ZLX-{verification_id}</p>
+            <p>Authorized by Zolarux Operations Unit</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Download file name; vendor names may contain spaces, slashes, quotes, etc.
+_CERT_FILE_NAME = "zolarux_{mode}_cert_{name}.html"
+_UNSAFE_FILE_CHARS = re.compile(r'[^\w-]+')
+
+# Step 4 copy for a vendor that passes STANDARD verification (one markdown element)
+_STANDARD_PRIVILEGES_MD = """**Privileges Unlocked:**
+- ✅ Can join WhatsApp Vendor Group
+- ✅ Can post items for sale on marketplace
+- ✅ Escrow protection enabled"""
+
+# Emoji removed from issue text on the certificate (single-pass str.translate)
+_EMOJI_STRIP = str.maketrans('', '', '❌🚩')
+
+# Progress indicator: icon index is 0 (pending), 1 (current) or 2 (done)
+_STEP_ICONS = ("⏸️", "📝", "✅")
+_STEP_LABELS = ("Data Collection", "Validation", "Decision")
+# Whole progress row per current step (1-4), rendered once at import
+_PROGRESS_ROWS = {
+    cur: '<div class="step-progress">{}</div>'.format("".join(
+        f"<h3>{_STEP_ICONS[(cur >= n) + (cur > n)]} {label}</h3>" for n, label in enumerate(_STEP_LABELS, 1)
+    ))
+    for cur in range(1, 5)
+}
+
+# Section header per step; steps 1 and 4 are filled with the mode via str.format
+_STEP_HEADERS = {
+    1: '<div class="section-header"><h2>📋 Step 1: {mode} Data Collection</h2></div>',
+    2: '<div class="section-header"><h2>🔍 Step 2: Quality Review</h2></div>',
+    3: '<div class="section-header"><h2>💬 Step 3: Interaction & Risk</h2></div>',
+    4: '<div class="section-header"><h2>📊 Final Decision: {mode}</h2></div>',
+}
+
+# Step 4 badge card, filled from a result's badge_info
+_RESULT_CARD = """
+<div class="metric-card-initial" style="background: {color}">
+    <div style="font-size: 2rem; font-weight: bold;">{badge}</div>
+    <div style="font-size: 1.2rem; margin-top: 10px;">{status}</div>
+</div>
+"""
+
+# Step 1 category options
+_CATEGORIES = ("", "Electronics", "Fashion", "Beauty", "Services", "Dropshipping", "Gadgets", "Other")
+
+# Initialize session state (the script re-runs top to bottom, so the {} is fresh each run)
+_SESSION_DEFAULTS = {'current_step': 1, 'vendor_data': {}, 'final_result': None}
+for _key, _value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, _value)
 
 # --- SIDEBAR: MODE SELECTION ---
 with st.sidebar:
@@ -72,16 +216,61 @@ with st.sidebar:
     
     # Store mode in simple variable for logic checks
     MODE = "INITIAL" if "STANDARD" in verification_mode_selection else "FULL"
+    IS_FULL = MODE == "FULL"
     st.session_state.verification_mode = MODE
     
     st.info(f"Currently running: **{MODE} VERIFICATION**")
-    if MODE == "INITIAL":
+    if not IS_FULL:
         st.caption("✅ Standard Verification\n✅ Pass/Fail Only\n✅ Full Access After 3 Transactions")
     else:
         st.caption("🛡️ Premium Tier\n🛡️ 100-Point Score\n🛡️ Loan Eligibility")
 
+# Scoring lookup tables (built once, not per call)
+_BASIC_INFO_WEIGHTS = (('has_name', 3), ('has_phone', 4), ('has_address', 4), ('has_social_media', 4))
+_DOCUMENT_WEIGHTS = (('has_id_photo', 5), ('has_supplier_proof', 5), ('has_operations_proof', 5), ('has_testimonials', 2.5))
+_REG_POINTS = {'none': 0, 'smedan': 3, 'cac': 5}
+_QUALITY_POINTS = {'poor': 1, 'acceptable': 3, 'excellent': 5}
+_QUALITY_KEYS = ('id_quality', 'registration_quality', 'supplier_quality', 'operations_quality')
+_TESTIMONIAL_POINTS = {'suspicious': 0, 'mixed': 5, 'authentic': 10}
+_COMM_POINTS = {'unprofessional': 0, 'professional': 10}
+
+# Recommendation tiers: (minimum score, recommendations), highest tier first
+_RECOMMENDATION_TIERS = (
+    (80, ("Approve for immediate onboarding", "Eligible for future loan facilities")),
+    (60, ("Approve with monitoring", "Review after first 3 transactions")),
+    (0, ("Reject application", "Request additional documentation if reapplying")),
+)
+
+# FULL-mode badges, lowest tier first; bisect_right on the sorted thresholds picks the index
+_FULL_BADGE_THRESHOLDS = (60, 80)
+_FULL_BADGES = (
+    {'badge': '🔴 Red (Rejected)', 'status': 'REJECTED', 'description': 'High risk. Do not onboard.', 'color': '#ef4444'},
+    {'badge': '🟡 Yellow (Conditional)', 'status': 'CONDITIONAL', 'description': 'Medium risk. Monitor closely.', 'color': '#f59e0b'},
+    {'badge': '🟢 Green (Verified)', 'status': 'APPROVED', 'description': 'Low risk. Eligible for Loans.', 'color': '#10b981'},
+)
+
+# INITIAL checks: (keys, issue), raised when none of the keys is set; in report order
+_INITIAL_CHECKS = (
+    (('has_name',), "Missing Business Name"),
+    (('has_phone',), "Missing Phone Number"),
+    (('has_location',), "Missing Location"),
+    (('has_id_photo',), "Missing ID Verification"),
+    (('has_supplier_proof', 'has_operations_proof'), "No Proof of Stock/Operations"),
+    (('agreed_to_rules',), "Did not agree to Escrow Rules"),
+    (('video_call_verified',), "Video Call Not Completed"),
+)
+
+# Risk rules: (predicate on vendor data, risk factor)
+_RISK_RULES = (
+    (lambda d: d.get('red_flags_count', 0) > 2, "Multiple red flags detected"),
+    (lambda d: d.get('registration_type') == 'none', "No business registration"),
+    (lambda d: not d.get('guarantor_count', 0), "No guarantors provided"),
+)
+
 # Scoring & Logic Class
 class VendorScorerV3:
+    __slots__ = ('data', 'mode', 'score', 'category_scores', 'recommendations', 'risk_factors', 'red_flags_count')
+
     def __init__(self, data, mode="FULL"):
         self.data = data
         self.mode = mode
@@ -89,27 +278,20 @@ class VendorScorerV3:
         self.category_scores = {}
         self.recommendations = []
         self.risk_factors = []
+        # Read once; used by both the INITIAL checks and the FULL interaction score
+        self.red_flags_count = int(data.get('red_flags_count', 0))
     
     # --- LOGIC FOR INITIAL MODE ---
     def assess_initial_verification(self):
         """Binary Pass/Fail logic for WhatsApp verification"""
-        checks = []
-        
-        # 1. Critical Data Presence
-        if not self.data.get('has_name'): checks.append("Missing Business Name")
-        if not self.data.get('has_phone'): checks.append("Missing Phone Number")
-        if not self.data.get('has_location'): checks.append("Missing Location")
-        if not self.data.get('has_id_photo'): checks.append("Missing ID Verification")
-        if not self.data.get('has_supplier_proof') and not self.data.get('has_operations_proof'): 
-            checks.append("No Proof of Stock/Operations")
-        
-        # 2. Process Compliance
-        if not self.data.get('agreed_to_rules'): checks.append("Did not agree to Escrow Rules")
-        if not self.data.get('video_call_verified'): checks.append("Video Call Not Completed")
-        
+        get = self.data.get
+
+        # 1. Critical Data Presence & 2. Process Compliance
+        checks = [issue for keys, issue in _INITIAL_CHECKS if not any(map(get, keys))]
+
         # 3. Behavioral Flags
-        if self.data.get('red_flags_count', 0) > 0: checks.append(f"Found {self.data.get('red_flags_count')} Red Flags")
-        if self.data.get('responsiveness_rating', 3) < 2: checks.append("Responsiveness too low")
+        if self.red_flags_count > 0: checks.append(f"Found {self.red_flags_count} Red Flags")
+        if get('responsiveness_rating', 3) < 2: checks.append("Responsiveness too low")
 
         # Result
         passed = len(checks) == 0
@@ -117,59 +299,47 @@ class VendorScorerV3:
         return {
             'passed': passed,
             'issues': checks,
-            'badge': '🔵 Standard Verified' if passed else '🔴 Verification Failed',
-            'status': 'VERIFIED - STANDARD TIER' if passed else 'FAILED',
-            'description': 'Eligible for Full Verification after 3 successful transactions.',
-            'color': '#2563eb' if passed else '#ef4444'
+            'badge_info': {
+                'badge': '🔵 Standard Verified' if passed else '🔴 Verification Failed',
+                'status': 'VERIFIED - STANDARD TIER' if passed else 'FAILED',
+                'description': 'Eligible for Full Verification after 3 successful transactions.',
+                'color': '#2563eb' if passed else '#ef4444'
+            }
         }
 
     # --- LOGIC FOR FULL MODE (Existing 100-Point System) ---
     def calculate_auto_score(self):
-        score = 0
+        get = self.data.get
         # Basic Info (15 pts)
-        if self.data.get('has_name'): score += 3
-        if self.data.get('has_phone'): score += 4
-        if self.data.get('has_address'): score += 4
-        if self.data.get('has_social_media'): score += 4
+        score = sum(weight for key, weight in _BASIC_INFO_WEIGHTS if get(key))
         self.category_scores['Basic Information'] = score
         
         # Documents (25 pts)
-        doc_score = 0
-        if self.data.get('has_id_photo'): doc_score += 5
-        doc_score += self.data.get('guarantor_count', 0) * 2.5
-        reg_points = {'none': 0, 'smedan': 3, 'cac': 5}
-        doc_score += reg_points.get(self.data.get('registration_type', 'none'), 0)
-        if self.data.get('has_supplier_proof'): doc_score += 5
-        if self.data.get('has_operations_proof'): doc_score += 5
-        if self.data.get('has_testimonials'): doc_score += 2.5
+        doc_score = sum(weight for key, weight in _DOCUMENT_WEIGHTS if get(key))
+        doc_score += get('guarantor_count', 0) * 2.5
+        doc_score += _REG_POINTS.get(get('registration_type', 'none'), 0)
         self.category_scores['Documents Submitted'] = doc_score
         score += doc_score
         return score
     
     def calculate_quality_score(self):
-        quality_points = {'poor': 1, 'acceptable': 3, 'excellent': 5}
-        score = 0
-        score += quality_points.get(self.data.get('id_quality', 'poor'), 0)
-        score += quality_points.get(self.data.get('registration_quality', 'poor'), 0)
-        score += quality_points.get(self.data.get('supplier_quality', 'poor'), 0)
-        score += quality_points.get(self.data.get('operations_quality', 'poor'), 0)
-        
-        testimonial_points = {'suspicious': 0, 'mixed': 5, 'authentic': 10}
-        score += testimonial_points.get(self.data.get('testimonial_quality', 'suspicious'), 0)
+        get = self.data.get
+        score = sum(_QUALITY_POINTS.get(get(key, 'poor'), 0) for key in _QUALITY_KEYS)
+        score += _TESTIMONIAL_POINTS.get(get('testimonial_quality', 'suspicious'), 0)
         
-        if self.data.get('has_refund_policy'): score += 2.5
-        if self.data.get('has_delivery_info'): score += 2.5
+        if get('has_refund_policy'): score += 2.5
+        if get('has_delivery_info'): score += 2.5
         
         self.category_scores['Document Quality'] = score
         return score
     
     def calculate_interaction_score(self):
+        get = self.data.get
         score = 0
-        score += self.data.get('responsiveness_rating', 1) * 2
-        comm_points = {'unprofessional': 0, 'professional': 10}
-        score += comm_points.get(self.data.get('communication_quality', 'unprofessional'), 0)
+        score += get('responsiveness_rating', 1) * 2
+        score += _COMM_POINTS.get(get('communication_quality', 'unprofessional'), 0)
         
-        red_flags = self.data.get('red_flags_count', 0)
+        red_flags = self.red_flags_count
         penalty = min(red_flags * 5, score)
         score -= penalty
         
@@ -192,293 +362,86 @@ class VendorScorerV3:
         if self.mode != "FULL":
             return
             
-        if self.score >= 80:
-            self.recommendations.append("Approve for immediate onboarding")
-            self.recommendations.append("Eligible for future loan facilities")
-        elif self.score >= 60:
-            self.recommendations.append("Approve with monitoring")
-            self.recommendations.append("Review after first 3 transactions")
-        else:
-            self.recommendations.append("Reject application")
-            self.recommendations.append("Request additional documentation if reapplying")
+        for threshold, recommendations in _RECOMMENDATION_TIERS:
+            if self.score >= threshold:
+                self.recommendations.extend(recommendations)
+                break
 
     def identify_risk_factors(self):
         """Identify risk factors for Full mode"""
         if self.mode != "FULL":
             return
             
-        if self.data.get('red_flags_count', 0) > 2:
-            self.risk_factors.append("Multiple red flags detected")
-        if self.data.get('registration_type') == 'none':
-            self.risk_factors.append("No business registration")
-        if not self.data.get('guarantor_count', 0):
-            self.risk_factors.append("No guarantors provided")
+        self.risk_factors = [risk for rule, risk in _RISK_RULES if rule(self.data)]
 
     def get_full_badge(self):
-        if self.score >= 80:
-            return {'badge': '🟢 Green (Verified)', 'status': 'APPROVED', 'description': 'Low risk. Eligible for Loans.', 'color': '#10b981'}
-        elif self.score >= 60:
-            return {'badge': '🟡 Yellow (Conditional)', 'status': 'CONDITIONAL', 'description': 'Medium risk. Monitor closely.', 'color': '#f59e0b'}
-        else:
-            return {'badge': '🔴 Red (Rejected)', 'status': 'REJECTED', 'description': 'High risk. Do not onboard.', 'color': '#ef4444'}
-
-# Header
-st.title("🛡️ Zolarux Verification")
-if MODE == "INITIAL":
-    st.markdown("### 🔵 Mode: Standard Verification (Marketplace Access)")
-else:
-    st.markdown("### 🟢 Mode: Premium Verification (Loan Eligibility)")
-
-# Progress indicator
-col1, col2, col3 = st.columns(3)
-with col1:
-    status1 = "✅" if st.session_state.current_step > 1 else "📝" if st.session_state.current_step == 1 else "⏸️"
-    st.markdown(f"### {status1} Data Collection")
-with col2:
-    status2 = "✅" if st.session_state.current_step > 2 else "📝" if st.session_state.current_step == 2 else "⏸️"
-    st.markdown(f"### {status2} Validation")
-with col3:
-    status3 = "✅" if st.session_state.current_step > 3 else "📝" if st.session_state.current_step == 3 else "⏸️"
-    st.markdown(f"### {status3} Decision")
-
-st.markdown("---")
-
-# ==========================================
-# STEP 1: DATA ENTRY
-# ==========================================
-if st.session_state.current_step == 1:
-    st.markdown(f'<div class="section-header"><h2>📋 Step 1: {MODE} Data Collection</h2></div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("#### 📝 Vendor Identity")
-        vendor_name = st.text_input("Business/Vendor Name *", key="vendor_name")
-        vendor_phone = st.text_input("Phone Number *", key="vendor_phone")
-        
-        # New: Location is critical for Initial
-        vendor_location = st.text_input("Location (City/State) *", key="vendor_location")
-        
-        vendor_category = st.selectbox("Category", 
-            ["", "Electronics", "Fashion", "Beauty", "Services", "Dropshipping", "Gadgets", "Other"],
-            key="vendor_category"
-        )
-        
-        # Only ask for Email in FULL mode, optional in INITIAL
-        if MODE == "FULL":
-            vendor_email = st.text_input("Email Address", key="vendor_email")
-        else:
-            vendor_email = "N/A (Initial)"
-            
-        assessment_date = st.date_input("Assessment Date", datetime.now(), key="assessment_date")
-        
-        st.markdown("#### ✅ Verification Checks")
-        has_name = st.checkbox("Name Provided", value=True, key="has_name")
-        has_phone = st.checkbox("Phone Validated", value=True, key="has_phone")
-        has_location = st.checkbox("Location Provided", value=True, key="has_location")
-        
-        # Address is full address in Full mode
-        if MODE == "FULL":
-            has_address = st.checkbox("Full Address Verified", key="has_address")
-            has_social_media = st.checkbox("Social Media Links", key="has_social_media")
-        else:
-            has_address = True # Assumed covered by location in initial
-            has_social_media = st.checkbox("Social Media (Optional)", key="has_social_media")
+        return _FULL_BADGES[bisect_right(_FULL_BADGE_THRESHOLDS, self.score)]
+
+# Cached scoring: Streamlit reruns the script on every interaction, so results
+# are memoized on the (hashable) vendor_data items.
+@st.cache_data(max_entries=128, show_spinner=False)
+def _assess_initial(data_items):
+    return VendorScorerV3(dict(data_items), mode="INITIAL").assess_initial_verification()
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _score_full(data_items):
+    scorer = VendorScorerV3(dict(data_items), mode="FULL")
+    score = scorer.calculate_total_score()
+    scorer.generate_recommendations()
+    scorer.identify_risk_factors()
+    return {
+        'score': score,
+        'category_scores': scorer.category_scores,
+        'recommendations': scorer.recommendations,
+        'risk_factors': scorer.risk_factors,
+        'badge_info': scorer.get_full_badge(),
+        'passed': score >= 60 # Arbitrary pass mark for full logic
+    }
 
-    with col2:
-        st.markdown("#### 📎 Proofs Submitted")
-        has_id_photo = st.checkbox("Valid ID (NIN/Voter/Passport) *", key="has_id_photo")
-        
-        # Simplified proof for Initial
-        st.markdown("**Proof of Stock / Operations**")
-        has_supplier_proof = st.checkbox("Supplier/Stock Proof (Video/Pic)", key="has_supplier_proof")
-        has_operations_proof = st.checkbox("Past Operations (Waybills/Chats)", key="has_operations_proof")
-        
-        has_testimonials = st.checkbox("Customer Testimonials", key="has_testimonials")
-        
-        # INITIAL SPECIFIC CHECKS
-        st.markdown("#### 🤝 Agreements")
-        agreed_to_rules = st.checkbox("Agreed to Escrow Rules *", key="agreed_to_rules")
-        video_call_verified = st.checkbox("Video Call Verification Passed *", key="video_call_verified")
-
-        # FULL MODE EXTRAS (Hidden in Initial)
-        if MODE == "FULL":
-            st.markdown("---")
-            st.markdown("#### 🟢 Full Verification Extras")
-            guarantor_count = st.radio("Guarantors", [0, 1, 2], key="guarantor_count")
-            registration_type = st.selectbox("Registration", ["none", "smedan", "cac"], key="registration_type")
-            has_refund_policy = st.checkbox("Refund Policy", key="has_refund_policy")
-            has_delivery_info = st.checkbox("Delivery Info", key="has_delivery_info")
-        else:
-            # Default values for Initial mode to prevent errors
-            guarantor_count = 0
-            registration_type = "none"
-            has_refund_policy = False
-            has_delivery_info = False
-
-    if st.button("Continue →", type="primary", use_container_width=True):
-        if not vendor_name or not vendor_phone:
-            st.error("⚠️ Business Name and Phone are required.")
-        else:
-            # Save to session
-            st.session_state.vendor_data.update({
-                'vendor_name': vendor_name, 'vendor_phone': vendor_phone, 
-                'vendor_location': vendor_location, 'vendor_email': vendor_email,
-                'vendor_category': vendor_category, 'assessment_date': assessment_date,
-                'has_name': has_name, 'has_phone': has_phone, 'has_location': has_location,
-                'has_address': has_address, 'has_social_media': has_social_media,
-                'has_id_photo': has_id_photo, 'has_supplier_proof': has_supplier_proof,
-                'has_operations_proof': has_operations_proof, 'has_testimonials': has_testimonials,
-                'agreed_to_rules': agreed_to_rules, 'video_call_verified': video_call_verified,
-                'guarantor_count': guarantor_count, 'registration_type': registration_type,
-                'has_refund_policy': has_refund_policy, 'has_delivery_info': has_delivery_info
-            })
-            st.session_state.current_step = 2
-            st.rerun()
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _file_to_data_url(file_bytes, mime):
+    """Base64 data URL for an uploaded image, cached on the file bytes.
 
-# ==========================================
-# STEP 2: DOCUMENT REVIEW
-# ==========================================
-elif st.session_state.current_step == 2:
-    st.markdown('<div class="section-header"><h2>🔍 Step 2: Quality Review</h2></div>', unsafe_allow_html=True)
-    
-    if MODE == "INITIAL":
-        st.info("ℹ️ **STANDARD MODE:** Simplified review. Ensure documents look legitimate. No granular scoring.")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.write("**ID Card Status:**")
-            id_quality = st.radio("ID Legibility", ["Clear", "Blurry/Fake"], key="id_quality_init")
-        with col2:
-            st.write("**Stock Proof Status:**")
-            stock_quality = st.radio("Stock/Ops Proof", ["Convincing", "Suspicious"], key="stock_quality_init")
-            
-        # Map simple inputs to complex keys for backend compatibility
-        id_q = 'excellent' if id_quality == 'Clear' else 'poor'
-        sup_q = 'excellent' if stock_quality == 'Convincing' else 'poor'
-        
-        # Defaults for ignored fields
-        registration_quality = 'poor'
-        operations_quality = sup_q
-        supplier_quality = sup_q
-        testimonial_quality = 'mixed'
+    The cache is process-wide and each entry is ~1.33x the upload, so it is bounded.
+    """
+    return f"data:{mime};base64,{base64.b64encode(file_bytes).decode()}"
 
-    else:
-        # FULL MODE SLIDERS
-        st.info("📌 **PREMIUM MODE:** Detailed quality scoring for credit worthiness.")
-        col1, col2 = st.columns(2)
-        with col1:
-            id_q = st.select_slider("ID Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="id_q")
-            registration_quality = st.select_slider("Reg Doc Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="reg_q")
-            supplier_quality = st.select_slider("Supplier Proof Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="sup_q")
-        with col2:
-            operations_quality = st.select_slider("Ops Proof Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="ops_q")
-            testimonial_quality = st.select_slider("Testimonial Auth", ['suspicious', 'mixed', 'authentic'], value='mixed', key="test_q")
-
-    col_back, col_next = st.columns(2)
-    with col_back:
-        if st.button("← Back"):
-            st.session_state.current_step = 1
-            st.rerun()
-    with col_next:
-        if st.button("Continue →", type="primary"):
-            st.session_state.vendor_data.update({
-                'id_quality': id_q,
-                'registration_quality': registration_quality,
-                'supplier_quality': supplier_quality,
-                'operations_quality': operations_quality if MODE == "FULL" else sup_q,
-                'testimonial_quality': testimonial_quality if MODE == "FULL" else 'mixed'
-            })
-            st.session_state.current_step = 3
-            st.rerun()
+def _verification_id(vendor_name):
+    """Stable 4-digit certificate ID; hash() is salted per process, crc32 is not"""
+    return f"{zlib.crc32(vendor_name.encode()) % 10000:04d}"
 
-# ==========================================
-# STEP 3: INTERACTION ASSESSMENT
-# ==========================================
-elif st.session_state.current_step == 3:
-    st.markdown('<div class="section-header"><h2>💬 Step 3: Interaction & Risk</h2></div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("#### ⚡ Responsiveness")
-        responsiveness_rating = st.slider("Response Speed (1=Slow, 5=Fast)", 1, 5, 3, key="resp_rate")
-        
-        st.markdown("#### 💬 Communication")
-        communication_quality = st.radio("Style", ['unprofessional', 'professional'], index=1, format_func=lambda x: x.title(), key="comm_q")
-    
-    with col2:
-        st.markdown("#### 🚩 Red Flags (Crucial)")
-        red_flags_count = st.number_input("Count of Red Flags", 0, 10, 0, help="Evasive answers, pressure tactics, mismatched names", key="red_flags")
-        
-        if red_flags_count > 0:
-            red_flags_notes = st.text_area("Describe Red Flags", placeholder="E.g. Name on ID different from Bank Name", key="rf_notes")
-        else:
-            red_flags_notes = "None"
-            
-        reviewer_notes = st.text_area("Internal Notes", placeholder="General impression...", key="rev_notes")
+def _html_list_items(items):
+    """<li> markup for each item, joined straight from an iterable"""
+    return "".join(map("<li>{}</li>".format, items))
 
-    col_back, col_next = st.columns(2)
-    with col_back:
-        if st.button("← Back"):
-            st.session_state.current_step = 2
-            st.rerun()
-    
-    with col_next:
-        if st.button("Generate Decision →", type="primary"):
-            st.session_state.vendor_data.update({
-                'responsiveness_rating': responsiveness_rating,
-                'communication_quality': communication_quality,
-                'red_flags_count': red_flags_count,
-                'red_flags_notes': red_flags_notes,
-                'reviewer_notes': reviewer_notes
-            })
-            
-            # RUN LOGIC
-            scorer = VendorScorerV3(st.session_state.vendor_data, mode=MODE)
-            
-            if MODE == "INITIAL":
-                result = scorer.assess_initial_verification()
-                st.session_state.final_result = result
-            else:
-                final_score = scorer.calculate_total_score()
-                scorer.generate_recommendations()
-                scorer.identify_risk_factors()
-                badge_info = scorer.get_full_badge()
-                st.session_state.final_result = {
-                    'scorer': scorer,
-                    'score': final_score,
-                    'badge_info': badge_info,
-                    'passed': final_score >= 60 # Arbitrary pass mark for full logic
-                }
-                
-            st.session_state.current_step = 4
-            st.rerun()
+# Stand-ins for the uploaded images in the cached certificate text. HTML comments
+# cannot come from the (escaped) vendor name, so str.replace finds only these.
+_LOGO_SLOT = "<!--cert-logo-->"
+_SIG_SLOT = "<!--cert-sig-->"
 
-# ==========================================
-# STEP 4: FINAL RESULT & CERTIFICATE
-# ==========================================
-elif st.session_state.current_step == 4:
-    res = st.session_state.final_result
-    data = st.session_state.vendor_data
-    
-    st.markdown(f'<div class="section-header"><h2>📊 Final Decision: {MODE}</h2></div>', unsafe_allow_html=True)
+# Text only: the images are spliced in afterwards so the cache never holds upload bytes
+@st.cache_data(show_spinner=False, max_entries=64, ttl=3600)
+def _build_certificate(data, res, generated_on):
+    """Certificate HTML with _LOGO_SLOT/_SIG_SLOT where the images go"""
+    mode = res['mode']
+    badge = res['badge_info']
 
     # ----------------------------------------
-    # 1. DEFINE CERTIFICATE TEXT VARIABLES
+    # CERTIFICATE TEXT VARIABLES
     # ----------------------------------------
-    if MODE == "INITIAL":
+    if mode == "INITIAL":
         # INITIAL MODE TEXT
         cert_title = "STANDARD VENDOR CERTIFICATE"
         verification_text = "STANDARD MARKETPLACE VERIFICATION"
-        
+
         # New Validity Text (Milestone based, not Date based)
         validity_html = '<p style="color:#333; font-weight:bold; margin-top:15px; font-size:12px; letter-spacing: 0.5px;">ELIGIBLE FOR PREMIUM VERIFICATION AFTER 3 SUCCESSFUL TRANSACTIONS</p>'
-        
+
         score_html = "" # No score shown
-        
+
         # Clean up issues list for mobile (remove emojis)
         if not res['passed']:
-             clean_issues = [issue.replace("❌", "").replace("🚩", "").strip() for issue in res['issues']]
-             issues_list = "".join([f"<li>{issue}</li>" for issue in clean_issues])
+             issues_list = _html_list_items(issue.translate(_EMOJI_STRIP).strip() for issue in res['issues'])
              report_html = f"<div style='text-align:left; margin-top:20px; color:red;'><strong>Issues Found:</strong><ul>{issues_list}</ul></div>"
         else:
              report_html = ""
@@ -487,25 +450,15 @@ elif st.session_state.current_step == 4:
         # FULL MODE TEXT
         cert_title = "PREMIUM VENDOR LICENSE"
         verification_text = "COMPREHENSIVE PREMIUM VERIFICATION"
-        
+
         validity_html = "" # No text here for full mode
-        
+
         score_html = f'<div class="score-display">{res["score"]}/100</div>'
-        
+
         # Recommendations & Risk Factors (Cleaned for mobile)
-        scorer = res['scorer']
-        if scorer.recommendations:
-            clean_recs = [rec.encode('ascii', 'ignore').decode('ascii').strip() for rec in scorer.recommendations]
-            recs_list = "".join([f"<li>{rec}</li>" for rec in clean_recs])
-        else:
-            recs_list = "<li>None</li>"
+        recs_list = _html_list_items(rec.encode('ascii', 'ignore').decode('ascii').strip() for rec in res['recommendations']) or "<li>None</li>"
+        risks_list = _html_list_items(risk.encode('ascii', 'ignore').decode('ascii').strip() for risk in res['risk_factors']) or "<li>None</li>"
 
-        if scorer.risk_factors:
-            clean_risks = [risk.encode('ascii', 'ignore').decode('ascii').strip() for risk in scorer.risk_factors]
-            risks_list = "".join([f"<li>{risk}</li>" for risk in clean_risks])
-        else:
-            risks_list = "<li>None</li>"
-        
         report_html = f"""
         <div style="text-align: left; margin-top: 30px; font-size: 11px; color: #444; border-top: 1px dashed #ccc; padding-top: 10px;">
             <p><strong>OFFICIAL ASSESSMENT REPORT</strong></p>
@@ -522,34 +475,320 @@ elif st.session_state.current_step == 4:
         </div>
         """
 
+    return _CERT_TEMPLATE.format_map({
+        'cert_css': _CERT_CSS,
+        'cert_color': badge['color'],
+        'cert_status': badge['status'],
+        'cert_title': cert_title,
+        'verification_text': verification_text,
+        'vendor_name': html.escape(data['vendor_name']),
+        'logo_html': _LOGO_SLOT,
+        'sig_html': _SIG_SLOT,
+        'score_html': score_html,
+        'validity_html': validity_html,
+        'report_html': report_html,
+        'generated_on': generated_on,
+        'verification_id': _verification_id(data['vendor_name'])
+    })
+
+def _certificate_bytes(data, res, logo, sig, generated_on):
+    """Certificate HTML as UTF-8 bytes; logo/sig are (bytes, mime) or None"""
+    # Process Images
+    logo_html = ""
+    if logo:
+        logo_html = f'<img src="{_file_to_data_url(*logo)}" style="max-height: 80px; border-radius: 50%; margin-bottom: 15px; display: block; margin-left: auto; margin-right: auto;">'
+
+    sig_html = ""
+    if sig:
+        sig_html = f'<div style="margin-top: 25px; text-align: center;"><img src="{_file_to_data_url(*sig)}" style="max-height: 120px; width: auto;"></div>'
+
+    cert = _build_certificate(data, res, generated_on)
+    return cert.replace(_LOGO_SLOT, logo_html, 1).replace(_SIG_SLOT, sig_html, 1).encode('utf-8')
+
+@st.fragment
+def _render_certificate(data, res):
+    """Certificate customization and download for step 4.
+
+    Runs as a fragment so logo/signature uploads rerun only this section.
+    """
+    mode = res['mode']
+
     # ----------------------------------------
-    # 2. DASHBOARD DISPLAY
+    # CERTIFICATE GENERATION
     # ----------------------------------------
-    badge = res if MODE == "INITIAL" else res['badge_info']
+    st.markdown("---")
+    st.markdown("### 📥 Download Certificate")
+    
+    with st.expander("🎨 Customize Certificate (Logo & Signature)", expanded=True):
+        col_c1, col_c2 = st.columns(2)
+        with col_c1:
+            uploaded_logo = st.file_uploader("Upload Company Logo", type=['png', 'jpg', 'jpeg'], key="cert_logo")
+        with col_c2:
+            uploaded_sig = st.file_uploader("Upload Authorized Signature", type=['png', 'jpg', 'jpeg'], key="cert_sig")
+
+    # Built only when the download button is clicked (Streamlit calls `data` lazily)
+    def build_certificate():
+        return _certificate_bytes(
+            data, res,
+            (uploaded_logo.getvalue(), uploaded_logo.type) if uploaded_logo else None,
+            (uploaded_sig.getvalue(), uploaded_sig.type) if uploaded_sig else None,
+            date.today().isoformat()
+        )
+    
+    st.download_button(
+        label="📄 Download Certificate",
+        data=build_certificate,
+        file_name=_CERT_FILE_NAME.format_map({
+            'mode': mode.lower(),
+            'name': _UNSAFE_FILE_CHARS.sub('_', data['vendor_name']).strip('_') or 'vendor'
+        }),
+        mime="text/html; charset=utf-8",
+        key="download_btn"
+    )
+
+# Header
+st.title("🛡️ Zolarux Verification")
+if not IS_FULL:
+    st.markdown("### 🔵 Mode: Standard Verification (Marketplace Access)")
+else:
+    st.markdown("### 🟢 Mode: Premium Verification (Loan Eligibility)")
+
+# Progress indicator
+st.markdown(_PROGRESS_ROWS[st.session_state.current_step], unsafe_allow_html=True)
+
+st.markdown("---")
+
+# ==========================================
+# STEP 1: DATA ENTRY
+# ==========================================
+if st.session_state.current_step == 1:
+    st.markdown(_STEP_HEADERS[1].format(mode=MODE), unsafe_allow_html=True)
+    
+    with st.form("step1_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### 📝 Vendor Identity")
+            vendor_name = st.text_input("Business/Vendor Name *", key="vendor_name")
+            vendor_phone = st.text_input("Phone Number *", key="vendor_phone")
+
+            # New: Location is critical for Initial
+            vendor_location = st.text_input("Location (City/State) *", key="vendor_location")
+
+            vendor_category = st.selectbox("Category", _CATEGORIES, key="vendor_category")
+
+            # Only ask for Email in FULL mode, optional in INITIAL
+            if IS_FULL:
+                vendor_email = st.text_input("Email Address", key="vendor_email")
+            else:
+                vendor_email = "N/A (Initial)"
+
+            assessment_date = st.date_input("Assessment Date", datetime.now(), key="assessment_date")
+
+            st.markdown("#### ✅ Verification Checks")
+            has_name = st.checkbox("Name Provided", value=True, key="has_name")
+            has_phone = st.checkbox("Phone Validated", value=True, key="has_phone")
+            has_location = st.checkbox("Location Provided", value=True, key="has_location")
+
+            # Address is full address in Full mode
+            if IS_FULL:
+                has_address = st.checkbox("Full Address Verified", key="has_address")
+                has_social_media = st.checkbox("Social Media Links", key="has_social_media")
+            else:
+                has_address = True # Assumed covered by location in initial
+                has_social_media = st.checkbox("Social Media (Optional)", key="has_social_media")
+
+        with col2:
+            st.markdown("#### 📎 Proofs Submitted")
+            has_id_photo = st.checkbox("Valid ID (NIN/Voter/Passport) *", key="has_id_photo")
+
+            # Simplified proof for Initial
+            st.markdown("**Proof of Stock / Operations**")
+            has_supplier_proof = st.checkbox("Supplier/Stock Proof (Video/Pic)", key="has_supplier_proof")
+            has_operations_proof = st.checkbox("Past Operations (Waybills/Chats)", key="has_operations_proof")
+
+            has_testimonials = st.checkbox("Customer Testimonials", key="has_testimonials")
+
+            # INITIAL SPECIFIC CHECKS
+            st.markdown("#### 🤝 Agreements")
+            agreed_to_rules = st.checkbox("Agreed to Escrow Rules *", key="agreed_to_rules")
+            video_call_verified = st.checkbox("Video Call Verification Passed *", key="video_call_verified")
+
+            # FULL MODE EXTRAS (Hidden in Initial)
+            if IS_FULL:
+                st.markdown("---")
+                st.markdown("#### 🟢 Full Verification Extras")
+                guarantor_count = st.radio("Guarantors", [0, 1, 2], key="guarantor_count")
+                registration_type = st.selectbox("Registration", ["none", "smedan", "cac"], key="registration_type")
+                has_refund_policy = st.checkbox("Refund Policy", key="has_refund_policy")
+                has_delivery_info = st.checkbox("Delivery Info", key="has_delivery_info")
+            else:
+                # Default values for Initial mode to prevent errors
+                guarantor_count = 0
+                registration_type = "none"
+                has_refund_policy = False
+                has_delivery_info = False
+
+        if st.form_submit_button("Continue →", type="primary", use_container_width=True):
+            if not vendor_name or not vendor_phone:
+                st.error("⚠️ Business Name and Phone are required.")
+            else:
+                # Save to session
+                st.session_state.vendor_data |= {
+                    'vendor_name': vendor_name, 'vendor_phone': vendor_phone, 
+                    'vendor_location': vendor_location, 'vendor_email': vendor_email,
+                    'vendor_category': vendor_category, 'assessment_date': assessment_date,
+                    'has_name': has_name, 'has_phone': has_phone, 'has_location': has_location,
+                    'has_address': has_address, 'has_social_media': has_social_media,
+                    'has_id_photo': has_id_photo, 'has_supplier_proof': has_supplier_proof,
+                    'has_operations_proof': has_operations_proof, 'has_testimonials': has_testimonials,
+                    'agreed_to_rules': agreed_to_rules, 'video_call_verified': video_call_verified,
+                    'guarantor_count': guarantor_count, 'registration_type': registration_type,
+                    'has_refund_policy': has_refund_policy, 'has_delivery_info': has_delivery_info
+                }
+                st.session_state.current_step = 2
+                st.rerun()
+
+# ==========================================
+# STEP 2: DOCUMENT REVIEW
+# ==========================================
+elif st.session_state.current_step == 2:
+    st.markdown(_STEP_HEADERS[2], unsafe_allow_html=True)
     
+    with st.form("step2_form"):
+        if not IS_FULL:
+            st.info("ℹ️ **STANDARD MODE:** Simplified review. Ensure documents look legitimate. No granular scoring.")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**ID Card Status:**")
+                id_quality = st.radio("ID Legibility", ["Clear", "Blurry/Fake"], key="id_quality_init")
+            with col2:
+                st.write("**Stock Proof Status:**")
+                stock_quality = st.radio("Stock/Ops Proof", ["Convincing", "Suspicious"], key="stock_quality_init")
+
+            # Map simple inputs to complex keys for backend compatibility
+            id_q = 'excellent' if id_quality == 'Clear' else 'poor'
+            sup_q = 'excellent' if stock_quality == 'Convincing' else 'poor'
+
+            # Defaults for ignored fields
+            registration_quality = 'poor'
+            operations_quality = sup_q
+            supplier_quality = sup_q
+            testimonial_quality = 'mixed'
+
+        else:
+            # FULL MODE SLIDERS
+            st.info("📌 **PREMIUM MODE:** Detailed quality scoring for credit worthiness.")
+            col1, col2 = st.columns(2)
+            with col1:
+                id_q = st.select_slider("ID Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="id_q")
+                registration_quality = st.select_slider("Reg Doc Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="reg_q")
+                supplier_quality = st.select_slider("Supplier Proof Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="sup_q")
+            with col2:
+                operations_quality = st.select_slider("Ops Proof Quality", ['poor', 'acceptable', 'excellent'], value='acceptable', key="ops_q")
+                testimonial_quality = st.select_slider("Testimonial Auth", ['suspicious', 'mixed', 'authentic'], value='mixed', key="test_q")
+
+        col_back, col_next = st.columns(2)
+        with col_back:
+            if st.form_submit_button("← Back"):
+                st.session_state.current_step = 1
+                st.rerun()
+        with col_next:
+            if st.form_submit_button("Continue →", type="primary"):
+                st.session_state.vendor_data |= {
+                    'id_quality': id_q,
+                    'registration_quality': registration_quality,
+                    'supplier_quality': supplier_quality,
+                    'operations_quality': operations_quality if IS_FULL else sup_q,
+                    'testimonial_quality': testimonial_quality if IS_FULL else 'mixed'
+                }
+                st.session_state.current_step = 3
+                st.rerun()
+
+# ==========================================
+# STEP 3: INTERACTION ASSESSMENT
+# ==========================================
+elif st.session_state.current_step == 3:
+    st.markdown(_STEP_HEADERS[3], unsafe_allow_html=True)
+    
+    with st.form("step3_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### ⚡ Responsiveness")
+            responsiveness_rating = st.slider("Response Speed (1=Slow, 5=Fast)", 1, 5, 3, key="resp_rate")
+
+            st.markdown("#### 💬 Communication")
+            communication_quality = st.radio("Style", ['unprofessional', 'professional'], index=1, format_func=lambda x: x.title(), key="comm_q")
+
+        with col2:
+            st.markdown("#### 🚩 Red Flags (Crucial)")
+            red_flags_count = st.number_input("Count of Red Flags", 0, 10, 0, help="Evasive answers, pressure tactics, mismatched names", key="red_flags")
+
+            # Widgets inside a form don't rerun on change, so the notes box is always shown
+            red_flags_notes = st.text_area("Describe Red Flags", placeholder="E.g. Name on ID different from Bank Name", key="rf_notes")
+            if red_flags_count == 0:
+                red_flags_notes = "None"
+
+            reviewer_notes = st.text_area("Internal Notes", placeholder="General impression...", key="rev_notes")
+
+        col_back, col_next = st.columns(2)
+        with col_back:
+            if st.form_submit_button("← Back"):
+                st.session_state.current_step = 2
+                st.rerun()
+
+        with col_next:
+            if st.form_submit_button("Generate Decision →", type="primary"):
+                st.session_state.vendor_data |= {
+                    'responsiveness_rating': responsiveness_rating,
+                    'communication_quality': communication_quality,
+                    'red_flags_count': red_flags_count,
+                    'red_flags_notes': red_flags_notes,
+                    'reviewer_notes': reviewer_notes
+                }
+
+                # RUN LOGIC
+                data_items = tuple(sorted(st.session_state.vendor_data.items()))
+                if not IS_FULL:
+                    st.session_state.final_result = _assess_initial(data_items)
+                else:
+                    st.session_state.final_result = _score_full(data_items)
+                result = st.session_state.final_result
+                result['mode'] = MODE
+                # Step 4 badge card, filled once here rather than on every Step 4 rerun
+                result['card_html'] = _RESULT_CARD.format_map(result['badge_info'])
+
+                st.session_state.current_step = 4
+                st.rerun()
+
+# ==========================================
+# STEP 4: FINAL RESULT & CERTIFICATE
+# ==========================================
+elif st.session_state.current_step == 4:
+    res = st.session_state.final_result
+    data = st.session_state.vendor_data
+    # Render the mode the decision was made in, even if the sidebar was toggled since
+    MODE = res['mode']
+    IS_FULL = MODE == "FULL"
+    
+    st.markdown(_STEP_HEADERS[4].format(mode=MODE), unsafe_allow_html=True)
+
+    # ----------------------------------------
+    # DASHBOARD DISPLAY
+    # ----------------------------------------
     col1, col2 = st.columns([2, 1])
     with col1:
-        st.markdown(f"""
-        <div class="metric-card-initial" style="background: {badge['color']}">
-            <div style="font-size: 2rem; font-weight: bold;">{badge['badge']}</div>
-            <div style="font-size: 1.2rem; margin-top: 10px;">{badge['status']}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(res['card_html'], unsafe_allow_html=True)
         
-        if MODE == "INITIAL":
+        if not IS_FULL:
             if res['passed']:
                 st.success("✅ Vendor has passed Standard Verification.")
-                st.markdown("**Privileges Unlocked:**")
-                st.markdown("- ✅ Can join WhatsApp Vendor Group")
-                st.markdown("- ✅ Can post items for sale on marketplace")
-                st.markdown("- ✅ Escrow protection enabled")
+                st.markdown(_STANDARD_PRIVILEGES_MD)
                 st.markdown("---")
                 st.info("**🎯 Next Milestone:** Complete **3 successful transactions** to unlock Premium Verification")
             else:
                 st.error("❌ Verification Failed")
-                st.markdown("**Reasons:**")
-                for issue in res['issues']:
-                    st.write(f"- {issue}")
+                st.markdown("**Reasons:**\n" + "".join(f"\n- {issue}" for issue in res['issues']))
         else:
             # Full Mode extra display
             pass 
@@ -557,134 +796,12 @@ elif st.session_state.current_step == 4:
     with col2:
         st.metric("Vendor", data['vendor_name'])
         st.caption(f"Location: {data['vendor_location']}")
-        if MODE == "INITIAL":
+        if not IS_FULL:
             st.write("**Tier:** Standard")
         else:
             st.write("**Tier:** Premium")
 
-    # ----------------------------------------
-    # 3. CERTIFICATE GENERATION
-    # ----------------------------------------
-    st.markdown("---")
-    st.markdown("### 📥 Download Certificate")
-    
-    with st.expander("🎨 Customize Certificate (Logo & Signature)", expanded=True):
-        col_c1, col_c2 = st.columns(2)
-        with col_c1:
-            uploaded_logo = st.file_uploader("Upload Company Logo", type=['png', 'jpg', 'jpeg'], key="cert_logo")
-        with col_c2:
-            uploaded_sig = st.file_uploader("Upload Authorized Signature", type=['png', 'jpg', 'jpeg'], key="cert_sig")
-
-    # Process Images
-    logo_html = ""
-    if uploaded_logo:
-        logo_b64 = base64.b64encode(uploaded_logo.getvalue()).decode()
-        logo_html = f'<img src="data:image/png;base64,{logo_b64}" style="max-height: 80px; border-radius: 50%; margin-bottom: 15px; display: block; margin-left: auto; margin-right: auto;">'
-    
-    sig_html = ""
-    if uploaded_sig:
-        sig_b64 = base64.b64encode(uploaded_sig.getvalue()).decode()
-        sig_html = f'<div style="margin-top: 25px; text-align: center;"><img src="data:image/png;base64,{sig_b64}" style="max-height: 120px; width: auto;"></div>'
-
-    cert_color = badge['color']
-    cert_status = badge['status']
-
-    html_report = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
-            body {{ font-family: 'Inter', sans-serif; padding: 40px; background: #fff; -webkit-print-color-adjust: exact; }}
-            .container {{ 
-                border: 5px solid {cert_color}; 
-                padding: 40px; 
-                border-radius: 15px; 
-                text-align: center; 
-                max-width: 800px; 
-                margin: 0 auto; 
-            }}
-            .header {{ 
-                background: {cert_color}; 
-                color: white; 
-                padding: 20px; 
-                margin: -40px -40px 30px -40px; 
-                border-radius: 9px 9px 0 0;
-            }}
-            .vendor {{ 
-                font-size: 32px; 
-                font-weight: bold; 
-                text-transform: uppercase; 
-                margin: 20px 0; 
-                color: #111;
-            }}
-            .badge {{ 
-                font-size: 24px; 
-                color: {cert_color}; 
-                font-weight: bold; 
-                border: 3px solid {cert_color}; 
-                padding: 10px 40px; 
-                border-radius: 50px; 
-                display: inline-block; 
-                margin: 15px 0;
-            }}
-            .score-display {{
-                font-size: 36px;
-                font-weight: 800;
-                color: {cert_color};
-                margin-bottom: 10px;
-            }}
-            .footer {{ 
-                margin-top: 40px; 
-                font-size: 12px; 
-                color: #666; 
-                border-top: 1px solid #ccc; 
-                padding-top: 20px; 
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                {logo_html}
-                <h1>{cert_title}</h1>
-                <p>Zolarux Trust Infrastructure</p>
-            </div>
-            
-            <p style="font-size: 16px; color: #555;">This officially certifies that</p>
-            
-            <div class="vendor">{data['vendor_name']}</div>
-            
-            <p style="font-size: 14px; color: #555;">has successfully undergone the <strong>{verification_text}</strong> process.</p>
-            
-            <br>
-            {score_html}
-            <div class="badge">{cert_status}</div>
-            
-            {validity_html}
-            
-            {report_html}
-            
-            {sig_html}
-            
-            <div class="footer">
-                <p>Generated on {datetime.now().strftime('%Y-%m-%d')}</p>
-                <p>Verification ID: ZLX-{hash(data['vendor_name']) % 10000:04d}</p>
-                <p>Authorized by Zolarux Operations Unit</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    st.download_button(
-        label="📄 Download Certificate",
-        data=html_report,
-        file_name=f"zolarux_{MODE.lower()}_cert_{data['vendor_name']}.html",
-        mime="text/html",
-        key="download_btn"
-    )
+    _render_certificate(data, res)
 
     if st.button("🔄 Start New Assessment"):
         st.session_state.current_step = 1